@@ -22,6 +22,10 @@ class SmallRoomsEnv(BaseEnvironment):
     # Mapping from action IDs to human-readable descriptions.
     ACTION_NAMES = {0: "UP", 1: "DOWN", 2: "LEFT", 3: "RIGHT"}
     ACTION_IDS = {"UP": 0, "DOWN": 1, "LEFT": 2, "RIGHT": 3}
+    # Mapping from action IDs to the (row, column) offset they move the agent by.
+    ACTION_OFFSETS = {0: (-1, 0), 1: (1, 0), 2: (0, -1), 3: (0, 1)}
+    # The agent has the same four actions available in every state.
+    AVAILABLE_ACTIONS = [0, 1, 2, 3]
 
     def __init__(self, options=[]):
         super().__init__(options)
@@ -53,11 +57,11 @@ class SmallRoomsEnv(BaseEnvironment):
 
     def get_action_space(self):
         # The agent has four actions (up, down, left, right).
-        return list([0, 1, 2, 3])
+        return list(self.AVAILABLE_ACTIONS)
 
     def get_available_actions(self, state):
         # The agent has access to all four actions in every state.
-        return self.get_action_space()
+        return list(self.AVAILABLE_ACTIONS)
 
     def is_state_terminal(self, state):
         # The state is only terminal if the agent has reached the goal.
@@ -104,17 +108,9 @@ class SmallRoomsEnv(BaseEnvironment):
         return rooms
 
     def _get_intended_cell(self, current_state, action):
-        intended_next_state = current_state
-
         # Change the agent's next position based on the direction it wants to move in.
-        if self.ACTION_NAMES[action] == "UP":
-            intended_next_state = (intended_next_state[0] - 1, intended_next_state[1])
-        elif self.ACTION_NAMES[action] == "DOWN":
-            intended_next_state = (intended_next_state[0] + 1, intended_next_state[1])
-        elif self.ACTION_NAMES[action] == "LEFT":
-            intended_next_state = (intended_next_state[0], intended_next_state[1] - 1)
-        elif self.ACTION_NAMES[action] == "RIGHT":
-            intended_next_state = (intended_next_state[0], intended_next_state[1] + 1)
+        row_offset, column_offset = self.ACTION_OFFSETS[action]
+        intended_next_state = (current_state[0] + row_offset, current_state[1] + column_offset)
 
         # If the agent has moved into a wall, return it to where it tried to move from.
         if self.rooms[intended_next_state] == "#":
@@ -16,6 +16,9 @@ class BaseEnvironment(ABC):
     You should implement one-step dynamics for your environment, a "reset" function to
     initialise a the envionrment before starting an episode, and a function for returning
     the options available to the agent in a given state.
+
+    States must be hashable and should be treated as immutable. The agent shares state objects
+    between trajectories, logs and Q-table updates rather than copying them.
     """
 
     def __init__(self):
@@ -270,6 +273,7 @@ class BaseEnvironment(ABC):
     def _generate_interaction_graph_unweighted(self, directed=False) -> "nx.DiGraph":
         # Generates a list of all reachable states, starting the search from the environment's initial states.
         states = []
+        visited_states = set()
         current_successor_states = self.get_initial_states()
 
         # Brute force construction of the state-transition graph. Starts with initial states,
@@ -277,7 +281,8 @@ class BaseEnvironment(ABC):
         while not len(current_successor_states) == 0:
             next_successor_states = []
             for successor_state in current_successor_states:
-                if not successor_state in states:
+                if successor_state not in visited_states:
+                    visited_states.add(successor_state)
                     states.append(successor_state)
 
                     if not self.is_state_terminal(successor_state):
@@ -285,7 +290,7 @@ class BaseEnvironment(ABC):
                         for (new_successor_state, _), _ in new_successors:
                             next_successor_states.append(new_successor_state)
 
-            current_successor_states = copy.deepcopy(next_successor_states)
+            current_successor_states = next_successor_states
 
         # Build state-transition graph.
         if directed:
@@ -307,6 +312,7 @@ class BaseEnvironment(ABC):
     def _generate_interaction_graph_weighted(self) -> "nx.DiGraph":
         # Generates a list of all reachable states, starting the search from the environment's initial states.
         states = []
+        visited_states = set()
         current_successor_states = self.get_initial_states()
 
         # Brute force construction of the state-transition graph. Starts with initial states,
@@ -314,7 +320,8 @@ class BaseEnvironment(ABC):
         while not len(current_successor_states) == 0:
             next_successor_states = []
             for successor_state in current_successor_states:
-                if not successor_state in states:
+                if successor_state not in visited_states:
+                    visited_states.add(successor_state)
                     states.append(successor_state)
 
                     if not self.is_state_terminal(successor_state):
@@ -322,7 +329,7 @@ class BaseEnvironment(ABC):
                         for (new_successor_state, _), _ in new_successors:
                             next_successor_states.append(new_successor_state)
 
-            current_successor_states = copy.deepcopy(next_successor_states)
+            current_successor_states = next_successor_states
 
         # Build state-transition graph with multiple edges between each pair of nodes.
         stg = nx.DiGraph()
@@ -104,8 +104,10 @@ class SubgoalOptionGenerator(GenericOptionGenerator):
             return random.choice(available_actions)
         # Greedy action, tie-breaking randomly.
         else:
-            max_value = max([q_table[(hash(state), hash(action))] for action in available_actions])
-            best_actions = [action for action in available_actions if q_table[(hash(state), hash(action))] == max_value]
+            state_hash = hash(state)
+            q_values = [q_table[(state_hash, hash(action))] for action in available_actions]
+            max_value = max(q_values)
+            best_actions = [action for action, q_value in zip(available_actions, q_values) if q_value == max_value]
             return random.choice(best_actions)
 
 
@@ -129,10 +131,10 @@ class SubgoalOption(BaseOption):
     def policy(self, state, test=False):
         # Return highest-valued option from the Q-table, breaking ties randomly.
         available_actions = self.env.get_available_options(state)
-        max_value = max([self.q_table.get((hash(state), hash(action)), 0) for action in available_actions])
-        return random.choice(
-            [option for option in available_actions if self.q_table[(hash(state), hash(option))] == max_value]
-        )
+        state_hash = hash(state)
+        q_values = [self.q_table.get((state_hash, hash(action)), 0) for action in available_actions]
+        max_value = max(q_values)
+        return random.choice([action for action, q_value in zip(available_actions, q_values) if q_value == max_value])
 
     def __str__(self):
         return f"SubgoalOption({self.subgoal})"
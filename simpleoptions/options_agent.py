@@ -1,17 +1,15 @@
 import gc
-import math
 import random
 import statistics
 import numpy as np
 from numpy.random import Generator as RNG
 
-from copy import copy
-from collections import defaultdict
+from collections import Counter, defaultdict
 from typing import Tuple, Hashable, List, Union, DefaultDict
 
 from simpleoptions.option import BaseOption
 from simpleoptions.environment import BaseEnvironment
-from simpleoptions.utils.math import discounted_return
+from simpleoptions.utils.math import discounted_returns
 
 
 class OptionAgent:
@@ -73,6 +71,7 @@ class OptionAgent:
         rewards: List[float],
         option: "BaseOption",
         n_step=False,
+        returns: Union[List[float], None] = None,
     ) -> None:
         """
         Performs Macro Q-Learning updates along the given trajectory for the given Option.
@@ -82,6 +81,7 @@ class OptionAgent:
             rewards (List[float]): The list of rewards earned each time-step while the Option was executing.
             option (Option): The option to perform an update for.
             n_step (bool): Whether or not to perform n-step updates. Defaults to False, performing one-step updates.
+            returns (List[float], optional): The discounted return from each time-step onwards, as computed by `discounted_returns`. Defaults to None, in which case it is computed from `rewards`.
         """
         # For Debuging - saves info about long-running options to a file.
         if (len(state_trajectory) > 500) and hasattr(option, "hierarchy_level"):
@@ -91,7 +91,7 @@ class OptionAgent:
                     f"Option {option.hierarchy_level}-{option.source_cluster}->{option.target_cluster} ran for {len(state_trajectory)} decision stages.\n"
                 )
                 # Write the q-values in the state it got stuck in.
-                most_common_state = max(set(state_trajectory), key=state_trajectory.count)
+                most_common_state = Counter(state_trajectory).most_common(1)[0][0]
                 q_values = {
                     str(o): option.q_table.get((hash(most_common_state), hash(o)), 0)
                     for o in self.env.get_available_options(most_common_state)
@@ -100,28 +100,31 @@ class OptionAgent:
                 quit()
 
         termination_state = state_trajectory[-1]
+        termination_state_hash = hash(termination_state)
+        option_hash = hash(option)
+        termination_keys = self._termination_keys(termination_state, termination_state_hash)
+
+        # Compute the discounted sum of rewards from each time-step onwards.
+        if returns is None:
+            returns = discounted_returns(rewards, self.gamma)
 
         for i in range(len(state_trajectory) - 1):
-            initiation_state = state_trajectory[i]
+            key = (hash(state_trajectory[i]), option_hash)
 
-            old_value = self.q_table[(hash(initiation_state), hash(option))]
+            old_value = self.q_table[key]
 
-            # Compute discounted sum of rewards.
-            discounted_sum_of_rewards = discounted_return(rewards[i:], self.gamma)
+            discounted_sum_of_rewards = returns[i]
 
             # Get Q-Values for Next State.
-            if not self.env.is_state_terminal(termination_state):
-                q_values = [
-                    self.q_table[(hash(termination_state), hash(o))]
-                    for o in self.env.get_available_options(termination_state)
-                ]
+            if termination_keys is not None:
+                q_values = [self.q_table[termination_key] for termination_key in termination_keys]
             # Cater for terminal states (Q-value is zero).
             else:
                 q_values = [0]
 
             # Perform Macro-Q Update
-            self.q_table[(hash(initiation_state), hash(option))] = old_value + self.macro_q_alpha * (
-                discounted_sum_of_rewards + math.pow(self.gamma, len(rewards) - i) * max(q_values) - old_value
+            self.q_table[key] = old_value + self.macro_q_alpha * (
+                discounted_sum_of_rewards + self.gamma ** (len(rewards) - i) * max(q_values) - old_value
             )
 
             # If we're not performing n-step updates, exit after the first iteration.
@@ -135,6 +138,7 @@ class OptionAgent:
         executed_option: BaseOption,
         higher_level_option: Union["BaseOption", None] = None,
         n_step=False,
+        returns: Union[List[float], None] = None,
     ) -> None:
         """
         Performs Intra-Option Learning updates along the given trajectory for the given Option.
@@ -145,36 +149,47 @@ class OptionAgent:
             executed_option (Option): The option that was executed.
             higher_level_option (Union[None, optional): The option whose policy chose the executed_option. Defaults to None, indicating that the option was executed under the base policy.
             n_step (bool): Whether or not to perform n-step updates. Defaults to False, performing one-step updates.
+            returns (List[float], optional): The discounted return from each time-step onwards, as computed by `discounted_returns`. Defaults to None, in which case it is computed from `rewards`.
         """
 
         termination_state = state_trajectory[-1]
+        termination_state_hash = hash(termination_state)
+        executed_option_hash = hash(executed_option)
+        higher_level_option_hash = hash(higher_level_option)
+        termination_keys = self._termination_keys(termination_state, termination_state_hash)
+
+        # Compute the discounted sum of rewards from each time-step onwards.
+        if returns is None:
+            returns = discounted_returns(rewards, self.gamma)
 
         for i in range(len(state_trajectory) - 1):
             initiation_state = state_trajectory[i]
+            initiation_state_hash = hash(initiation_state)
+
+            # The discounted return and the discount applied to the next state's value are the same for every option.
+            discounted_sum_of_rewards = returns[i]
+            discount = self.gamma ** (len(rewards) - i)
 
             # We perform an intra-option update for all other options which select executed_option in this state.
             for other_option in self.env.get_available_options(initiation_state):
+                other_option_hash = hash(other_option)
                 if (
-                    (hash(other_option) != hash(higher_level_option) or higher_level_option is None)
-                    and hash(other_option.policy(initiation_state)) == hash(executed_option)
+                    (higher_level_option is None or other_option_hash != higher_level_option_hash)
+                    and hash(other_option.policy(initiation_state)) == executed_option_hash
                     # and other_option.initiation(initiation_state) # This check is already handled in env.get_available_options!
                 ):
-                    old_value = self.q_table[(hash(initiation_state), hash(other_option))]
-
-                    # Compute discounted sum of rewards.
-                    discounted_sum_of_rewards = discounted_return(rewards[i:], self.gamma)
+                    key = (initiation_state_hash, other_option_hash)
+                    old_value = self.q_table[key]
 
-                    if not self.env.is_state_terminal(termination_state):
+                    if termination_keys is not None:
+                        termination_prob = other_option.termination(termination_state)
                         # If the option terminates, we consider the value of the next best option.
-                        next_q_terminates = other_option.termination(termination_state) * max(
-                            [
-                                self.q_table[(hash(termination_state), hash(o))]
-                                for o in self.env.get_available_options(termination_state)
-                            ]
+                        next_q_terminates = termination_prob * max(
+                            [self.q_table[termination_key] for termination_key in termination_keys]
                         )
                         # If the option continues, we consider the value of the currently executing option.
-                        next_q_continues = (1 - other_option.termination(termination_state)) * self.q_table[
-                            (hash(termination_state), hash(other_option))
+                        next_q_continues = (1 - termination_prob) * self.q_table[
+                            (termination_state_hash, other_option_hash)
                         ]
 
                     else:
@@ -182,10 +197,8 @@ class OptionAgent:
                         next_q_continues = 0
 
                     # Perform Intra-Option Update.
-                    self.q_table[(hash(initiation_state), hash(other_option))] = old_value + self.intra_option_alpha * (
-                        discounted_sum_of_rewards
-                        + math.pow(self.gamma, len(rewards) - i) * (next_q_continues + next_q_terminates)
-                        - old_value
+                    self.q_table[key] = old_value + self.intra_option_alpha * (
+                        discounted_sum_of_rewards + discount * (next_q_continues + next_q_terminates) - old_value
                     )
 
             # If we're not performing n-step updates, exit after the first iteration.
@@ -219,11 +232,13 @@ class OptionAgent:
             else:
                 available_options = self.env.get_available_options(state, exploration=False)
                 # Find Q-values of available options.
-                q_values = [self.q_table[(hash(state), hash(o))] for o in available_options]
+                state_hash = hash(state)
+                q_values = [self.q_table[(state_hash, hash(o))] for o in available_options]
+                max_q_value = max(q_values)
 
                 # Return the option with the highest Q-value, breaking ties randomly.
                 return available_options[
-                    self.rng.choice([idx for idx, q_value in enumerate(q_values) if q_value == max(q_values)])
+                    self.rng.choice([idx for idx, q_value in enumerate(q_values) if q_value == max_q_value])
                 ]
         # If we are currently following an option's policy, return what it selects.
         else:
@@ -301,7 +316,7 @@ class OptionAgent:
 
                 # Handle if the selected option is a higher-level option.
                 if isinstance(selected_option, BaseOption):
-                    self.executing_options.append(copy(selected_option))
+                    self.executing_options.append(selected_option)
                     self.executing_options_states.append([state])
                     self.executing_options_rewards.append([])
 
@@ -329,19 +344,23 @@ class OptionAgent:
 
                     state = next_state
 
-                    for i in range(len(self.executing_options)):
-                        self.executing_options_states[i].append(next_state)
-                        self.executing_options_rewards[i].append(reward)
+                    for option_states, option_rewards in zip(
+                        self.executing_options_states, self.executing_options_rewards
+                    ):
+                        option_states.append(next_state)
+                        option_rewards.append(reward)
 
                     # Terminate any options which need terminating this time-step.
                     while self.executing_options and self._roll_termination(self.executing_options[-1], next_state):
                         if self.executing_options[-1] not in self.env.exploration_options:
+                            returns = discounted_returns(self.executing_options_rewards[-1], self.gamma)
                             # Perform a macro-q learning update for the terminating option.
                             self.macro_q_learn(
                                 self.executing_options_states[-1],
                                 self.executing_options_rewards[-1],
                                 self.executing_options[-1],
                                 self.n_step_updates,
+                                returns,
                             )
                             # Perform an intra-option learning update for the terminating option.
                             self.intra_option_learn(
@@ -350,6 +369,7 @@ class OptionAgent:
                                 self.executing_options[-1],
                                 self.executing_options[-2] if len(self.executing_options) > 1 else None,
                                 self.n_step_updates,
+                                returns,
                             )
                         self.executing_options_states.pop()
                         self.executing_options_rewards.pop()
@@ -384,14 +404,21 @@ class OptionAgent:
 
                 # Handle if the current state is terminal.
                 if terminal:
+                    # Each executing option's rewards are a suffix of the outermost option's rewards, so we compute
+                    # the discounted returns once and share them between all of the options terminating here.
+                    if self.executing_options:
+                        shared_returns = discounted_returns(self.executing_options_rewards[0], self.gamma)
+
                     while len(self.executing_options) > 0:
                         if self.executing_options[-1] not in self.env.exploration_options:
+                            returns = shared_returns[-len(self.executing_options_rewards[-1]) - 1 :]
                             # Perform a macro-q learning update for the topmost option.
                             self.macro_q_learn(
                                 self.executing_options_states[-1],
                                 self.executing_options_rewards[-1],
                                 self.executing_options[-1],
                                 self.n_step_updates,
+                                returns,
                             )
                             # Perform an intra-option learning update for the topmost option.
                             self.intra_option_learn(
@@ -400,6 +427,7 @@ class OptionAgent:
                                 self.executing_options[-1],
                                 self.executing_options[-2] if len(self.executing_options) > 1 else None,
                                 self.n_step_updates,
+                                returns,
                             )
                         self.executing_options_states.pop()
                         self.executing_options_rewards.pop()
@@ -470,7 +498,7 @@ class OptionAgent:
 
                 # Handle if the selected option is a higher-level option.
                 if isinstance(selected_option, BaseOption):
-                    executing_options.append(copy(selected_option))
+                    executing_options.append(selected_option)
 
                 # Handle if the selected option is a primitive action.
                 else:
@@ -512,6 +540,13 @@ class OptionAgent:
 
         return statistics.mean(test_total_rewards)
 
+    def _termination_keys(self, termination_state: Hashable, termination_state_hash: int) -> Union[List[Tuple], None]:
+        # Builds the Q-table keys of the options available in the given termination state, so that they can be
+        # reused by every update along a trajectory. Returns None if the state is terminal (its Q-value is zero).
+        if self.env.is_state_terminal(termination_state):
+            return None
+        return [(termination_state_hash, hash(o)) for o in self.env.get_available_options(termination_state)]
+
     def _roll_termination(self, option: "BaseOption", state: Hashable):
         # Rolls on whether or not the given option terminates in the given state.
         # Will work with stochastic and deterministic termination functions.
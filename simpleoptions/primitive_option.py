@@ -15,6 +15,7 @@ class PrimitiveOption(BaseOption):
     # work around that fixes issues with Dill load (specifically overloading hash) \
     # https://stackoverflow.com/questions/75409930/pickle-and-dill-cant-load-objects-with-overridden-hash-function-attributee
     action = ""
+    _hash = None
 
     def __init__(self, action: Hashable, env: "BaseEnvironment"):
         """Constructs a new primitive option.
@@ -25,6 +26,7 @@ class PrimitiveOption(BaseOption):
         """
         self.env = env
         self.action = action
+        self._hash = hash((self._class_id, self.action))
 
         # Constructs the initiation set for this primitive option.
         self.initiation_set = set()
@@ -48,7 +50,15 @@ class PrimitiveOption(BaseOption):
         return str(self)
 
     def __hash__(self):
-        return hash((self._class_id, self.action))
+        # Primitive options are hashed for every Q-table access, so the hash is cached on construction.
+        if self._hash is None:
+            return hash((self._class_id, self.action))
+        return self._hash
+
+    def __setstate__(self, state):
+        # Hashes of strings are not stable across processes, so recompute the cached hash after unpickling.
+        self.__dict__.update(state)
+        self._hash = hash((self._class_id, self.action))
 
     def __eq__(self, other_option):
         if isinstance(other_option, PrimitiveOption):
@@ -26,3 +26,24 @@ def discounted_return(rewards: List[Number], gamma: float) -> Number:
         gamma_power *= gamma
 
     return discounted_sum_of_rewards
+
+
+def discounted_returns(rewards: List[Number], gamma: float) -> List[Number]:
+    """
+    Given a list of rewards and a discount factor, computes the discounted sum of rewards
+    from every time step onwards in a single backwards pass.
+
+    Args:
+        rewards (List[Number]): The list of rewards, where rewards[i] is the reward at time step i.
+        gamma (float): The discount factor.
+
+    Returns:
+        List[Number]: The discounted returns, where the i-th element is the discounted sum of rewards[i:].
+            Has one more element than `rewards`, the last of which is always zero.
+    """
+    returns = [0.0] * (len(rewards) + 1)
+
+    for i in range(len(rewards) - 1, -1, -1):
+        returns[i] = rewards[i] + gamma * returns[i + 1]
+
+    return returns
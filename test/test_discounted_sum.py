@@ -1,6 +1,8 @@
 import pytest
 
-from simpleoptions.utils.math import discounted_return
+from pytest import approx
+
+from simpleoptions.utils.math import discounted_return, discounted_returns
 
 
 # Test single reward.
@@ -45,3 +47,26 @@ def test_discounted_reward_negative():
     discounted_reward = discounted_return(rewards, gamma)
 
     assert discounted_reward == correct_discounted_reward
+
+
+# Test that the discounted return from every time step matches the discounted sum of the remaining rewards.
+def test_discounted_returns_multiple():
+    rewards = [1, 2, 3, 4, 5]
+    gamma = 0.9
+
+    discounted_rewards = discounted_returns(rewards, gamma)
+
+    assert len(discounted_rewards) == len(rewards) + 1
+    for i in range(len(rewards)):
+        assert discounted_rewards[i] == approx(discounted_return(rewards[i:], gamma))
+    assert discounted_rewards[-1] == 0
+
+
+# Test for an empty list of rewards.
+def test_discounted_returns_empty():
+    rewards = []
+    gamma = 0.9
+
+    discounted_rewards = discounted_returns(rewards, gamma)
+
+    assert discounted_rewards == [0]
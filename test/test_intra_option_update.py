@@ -1,6 +1,7 @@
 import pytest
 
 from simpleoptions import OptionAgent, BaseOption
+from simpleoptions.utils.math import discounted_returns
 
 
 class DummyOption(BaseOption):
@@ -119,3 +120,40 @@ def test_one_step_intra_option_update_2():
     # q-value of executing option_2 in state_1 remains at 0.0.
     assert agent.q_table.get((hash("state_1"), hash(option_1)), 0) == 0.2
     assert agent.q_table.get((hash("state_1"), hash(option_2)), 0) == 0.0
+
+
+# Test that passing precomputed discounted returns for a nested option's trajectory gives the same update.
+def test_n_step_intra_option_update_precomputed_returns():
+    # The nested option's trajectory is a suffix of the outer option's trajectory.
+    state_trajectory = ["state_1", "state_2", "state_3", "state_4"]
+    reward_trajectory = [2, 3, 4]
+    nested_state_trajectory = state_trajectory[1:]
+    nested_reward_trajectory = reward_trajectory[1:]
+    alpha = 0.2
+    gamma = 0.9
+
+    lower_level_option = DummyOption("lower_level_option", 1, "state_4")
+    option_1 = DummyOption("test_option_1", lower_level_option, "state_4")
+    option_2 = DummyOption("test_option_2", lower_level_option, "state_4")
+    env = DummyEnv([option_1, option_2, lower_level_option])
+
+    agent = OptionAgent(env=env, intra_option_alpha=alpha, gamma=gamma)
+    agent.intra_option_learn(
+        nested_state_trajectory, nested_reward_trajectory, lower_level_option, option_1, n_step=True, returns=None
+    )
+
+    # Slice the outer trajectory's discounted returns, as run_agent does when all executing options terminate.
+    shared_returns = discounted_returns(reward_trajectory, gamma)
+    precomputed_agent = OptionAgent(env=env, intra_option_alpha=alpha, gamma=gamma)
+    precomputed_agent.intra_option_learn(
+        nested_state_trajectory,
+        nested_reward_trajectory,
+        lower_level_option,
+        option_1,
+        n_step=True,
+        returns=shared_returns[-len(nested_reward_trajectory) - 1 :],
+    )
+
+    # option_2 also selects lower_level_option, so it should have been updated in both cases.
+    assert precomputed_agent.q_table[(hash("state_2"), hash(option_2))] != 0
+    assert dict(precomputed_agent.q_table) == dict(agent.q_table)
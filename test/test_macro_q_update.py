@@ -1,6 +1,7 @@
 import pytest
 
 from simpleoptions import BaseOption, OptionAgent
+from simpleoptions.utils.math import discounted_returns
 
 
 class DummyOption(BaseOption):
@@ -195,3 +196,31 @@ def test_three_step_macro_q_update_2():
     assert agent.q_table[(hash("state_3"), hash(option))] == initial_values["state_3, option"] + alpha * (
         reward_trajectory[2] + gamma**1 * initial_values["state_4, 1"] - initial_values["state_3, option"]
     )
+
+
+# Test that passing precomputed discounted returns for a nested option's trajectory gives the same update.
+def test_n_step_macro_q_update_precomputed_returns():
+    # The nested option's trajectory is a suffix of the outer option's trajectory.
+    state_trajectory = ["state_1", "state_2", "state_3", "state_4"]
+    reward_trajectory = [2, 3, 4]
+    nested_state_trajectory = state_trajectory[1:]
+    nested_reward_trajectory = reward_trajectory[1:]
+    option = DummyOption("test_option_1")
+    alpha = 0.2
+    gamma = 0.9
+
+    agent = OptionAgent(DummyEnv(), macro_alpha=alpha, gamma=gamma)
+    agent.macro_q_learn(nested_state_trajectory, nested_reward_trajectory, option, n_step=True, returns=None)
+
+    # Slice the outer trajectory's discounted returns, as run_agent does when all executing options terminate.
+    shared_returns = discounted_returns(reward_trajectory, gamma)
+    precomputed_agent = OptionAgent(DummyEnv(), macro_alpha=alpha, gamma=gamma)
+    precomputed_agent.macro_q_learn(
+        nested_state_trajectory,
+        nested_reward_trajectory,
+        option,
+        n_step=True,
+        returns=shared_returns[-len(nested_reward_trajectory) - 1 :],
+    )
+
+    assert dict(precomputed_agent.q_table) == dict(agent.q_table)
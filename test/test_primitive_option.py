@@ -0,0 +1,56 @@
+import copy
+import pickle
+import pytest
+
+from simpleoptions import PrimitiveOption
+
+
+class DummyEnv:
+    """
+    Dummy class to pass in as an environment - implements only what we need.
+    """
+
+    def get_state_space(self):
+        return {0, 1, 2}
+
+    def get_available_actions(self, state=None):
+        return ["left", "right"]
+
+
+# Test that the cached hash matches the hash of the option's class ID and action.
+def test_primitive_option_hash():
+    option = PrimitiveOption("left", DummyEnv())
+
+    assert hash(option) == hash((PrimitiveOption._class_id, "left"))
+
+
+# Test that an unpickled option recomputes its hash rather than keeping the pickled one.
+def test_primitive_option_hash_after_unpickling():
+    option = PrimitiveOption("left", DummyEnv())
+
+    # Simulate a hash cached in a different process (string hashes are not stable across processes).
+    option._hash = 12345
+    unpickled_option = pickle.loads(pickle.dumps(option))
+
+    assert hash(unpickled_option) == hash((PrimitiveOption._class_id, "left"))
+    assert unpickled_option == option
+
+
+# Test that an unpickled option can still be used to look up dictionary keys.
+def test_primitive_option_dict_key_after_unpickling():
+    option = PrimitiveOption("right", DummyEnv())
+
+    unpickled_options = pickle.loads(pickle.dumps({option: 1.0}))
+
+    assert unpickled_options[option] == 1.0
+    assert all(hash(key) == hash((PrimitiveOption._class_id, "right")) for key in unpickled_options)
+
+
+# Test that a copied option has the same hash as, and is equal to, the original.
+def test_primitive_option_copy():
+    option = PrimitiveOption("right", DummyEnv())
+
+    copied_option = copy.copy(option)
+
+    assert hash(copied_option) == hash((PrimitiveOption._class_id, "right"))
+    assert copied_option == option
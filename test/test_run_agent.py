@@ -1,3 +1,4 @@
+import random
 import pytest
 
 from pytest import approx
@@ -68,6 +69,32 @@ class DummyHigherLevelOption(BaseOption):
         return not self == other_option
 
 
+class DummyExplorationOption(BaseOption):
+    # Only defines __hash__, so equality falls back to identity.
+    def __init__(self, id: int, action: PrimitiveOption):
+        super().__init__()
+        self.id = id
+        self.action = action
+
+    def initiation(self, state):
+        return True
+
+    def policy(self, state, test=False):
+        return self.action
+
+    def termination(self, state):
+        return state in {3, 6}
+
+    def __str__(self):
+        return f"DummyExplorationOption({self.id})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __hash__(self):
+        return hash(str(self))
+
+
 class DummyEnv(BaseEnvironment):
     def __init__(self):
         super().__init__()
@@ -801,3 +828,40 @@ def test_episodic_evaluation_rewards_length():
         verbose_logging=False,
     )
     assert len(episodic_testing_rewards) == 1
+
+
+def test_exploration_option_not_updated():
+    epsilon = 1.0
+    macro_alpha = 0.5
+    intra_option_alpha = 0.5
+    gamma = 0.9
+    default_action_value = 0.0
+
+    # Initialise env and add an exploration option with identity equality alongside the primitive options.
+    env = DummyEnv()
+    p0 = PrimitiveOption(0, env)
+    p1 = PrimitiveOption(1, env)
+    exploration_option = DummyExplorationOption(1, p1)
+    env.set_options([p0, p1])
+    env.set_exploration_options([exploration_option])
+
+    # Initialise agent which always acts randomly, so that the exploration option gets executed.
+    agent = OptionAgent(
+        env=env,
+        epsilon=epsilon,
+        macro_alpha=macro_alpha,
+        intra_option_alpha=intra_option_alpha,
+        gamma=gamma,
+        n_step_updates=False,
+        default_action_value=default_action_value,
+        rng=random.Random(0),
+    )
+
+    _ = agent.run_agent(num_epochs=10, epoch_length=20)
+
+    # Check that the exploration option was actually executed.
+    assert any(str(exploration_option) in active_options for active_options in agent.training_log["active_options"])
+
+    # Check that the exploration option's q-values have not been updated.
+    for state in env.get_state_space():
+        assert agent.q_table[(hash(state), hash(exploration_option))] == default_action_value